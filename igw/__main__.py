@@ -0,0 +1,21 @@
+"""Production entry point: `python -m igw`.
+
+Runs Uvicorn with uvloop + httptools instead of the asyncio default loop.
+Engines and caches are module-level, so each worker process builds its own
+on import.
+"""
+
+import os
+
+import uvicorn
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "igw.app.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8001")),
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+        access_log=False,
+    )
@@ -0,0 +1,22 @@
+"""Shared outbound HTTP clients.
+
+The Instagram token/graph calls used to open a fresh httpx.AsyncClient per
+login, paying TCP+TLS handshakes to api.instagram.com every time. One
+app-scoped client with keep-alive pooling is created at startup and shared
+by all callback invocations; main.py owns its lifecycle.
+"""
+
+import httpx
+from fastapi import Request
+
+
+def make_ig_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(20.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
+
+
+def get_ig_client(request: Request) -> httpx.AsyncClient:
+    """FastAPI dependency: the app-scoped Instagram client."""
+    return request.app.state.ig_client
@@ -0,0 +1,75 @@
+"""FastAPI application entry point: creates the app and wires the routers."""
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+from .http_clients import make_ig_client
+from .providers.bsg.router import BsgAuthError, missing_params_response
+from .providers.bsg.router import router as bsg_router
+from .providers.bsg.router import start_session_writer
+from .routes.auth import router as auth_router
+from .routes.fb_policy import router as fb_policy_router
+from .routes.oauth_instagram import router as oauth_instagram_router
+
+app = FastAPI(title="IGW", default_response_class=ORJSONResponse)
+
+
+class _BsgQueryGate:
+    """ASGI gate that rejects /betsoft/* calls missing token or hash.
+
+    Obviously malformed callbacks never reach FastAPI's routing/DI/Pydantic
+    machinery; a bytes scan of the raw query string is enough, since a false
+    pass just falls through to the full verification in the router. getAccount
+    is exempt because it authenticates on userId rather than a game token.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["path"].startswith("/betsoft/")
+            and not scope["path"].endswith("/getAccount.do")
+        ):
+            q = scope.get("query_string", b"")
+            if b"token=" not in q or b"hash=" not in q:
+                # the query carries bankId, so the reply matches the bank's
+                # protocol (and the 200 the in-router failures use)
+                await missing_params_response(q)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(_BsgQueryGate)
+
+
+@app.exception_handler(BsgAuthError)
+async def _bsg_auth_error(request, exc: BsgAuthError):
+    return exc.response
+
+
+app.include_router(oauth_instagram_router)
+app.include_router(auth_router)
+app.include_router(fb_policy_router)
+app.include_router(bsg_router)
+
+
+@app.on_event("startup")
+async def _start_bsg_session_writer():
+    start_session_writer()
+
+
+@app.on_event("startup")
+async def _open_ig_client():
+    app.state.ig_client = make_ig_client()
+
+
+@app.on_event("shutdown")
+async def _close_ig_client():
+    await app.state.ig_client.aclose()
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
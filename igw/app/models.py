@@ -0,0 +1,93 @@
+"""ORM models: players, their wallets and login / game sessions."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    TypeDecorator,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class CentsInt(TypeDecorator):
+    """Integer minor units in Python, NUMERIC(18,2) major units in the DB.
+
+    Keeps Decimal at the DB boundary only: handlers do plain int arithmetic
+    on balances and the conversion happens once per bind/result.
+    """
+
+    impl = Numeric(18, 2)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(value) / 100
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return int(value * 100)
+
+    def coerce_compared_value(self, op, value):
+        # literals in expressions against this column (e.g. the *100 in the
+        # server-side cents cast) must bind as plain NUMERIC; running them
+        # through process_bind_param would divide the multiplier by 100
+        return self.impl
+
+
+class Player(Base):
+    __tablename__ = "players"
+
+    userId = Column(Integer, primary_key=True, autoincrement=True)
+    ext_user_id = Column(String(64), unique=True, index=True, nullable=True)
+    user_name = Column(String(128), nullable=True)
+    email = Column(String(255), unique=True, index=True, nullable=True)
+    password_hash = Column(String(128), nullable=True)
+    first_name = Column(String(128), nullable=True)
+    last_name = Column(String(128), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Wallet(Base):
+    __tablename__ = "wallets"
+
+    wallet_id = Column(Integer, primary_key=True, autoincrement=True)
+    userId = Column(Integer, ForeignKey("players.userId"), index=True, nullable=False)
+    currency_code = Column(String(3), nullable=False)
+    balance = Column(CentsInt, nullable=False, default=0)
+    # bumped on every debit/credit; lets /getBalance answer 304 via ETag
+    version = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class UserSession(Base):
+    __tablename__ = "user_sessions"
+    __table_args__ = (
+        # lets the batched session writer upsert idempotently under retries
+        UniqueConstraint("token", "session_type", "provider", name="uq_user_sessions_token_type_provider"),
+        # covers the authenticate existence probe on a growing session table
+        Index("ix_user_sessions_token_status", "token", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    userId = Column(Integer, ForeignKey("players.userId"), index=True, nullable=False)
+    token = Column(Text, nullable=False)
+    session_type = Column(String(16), nullable=False, default="app")  # app | game
+    provider = Column(String(32), nullable=False, default="local")  # local | instagram | bsg
+    status = Column(String(16), nullable=False, default="active")  # active | logged_out | expired
+    ip = Column(String(64), nullable=True)
+    user_agent = Column(String(255), nullable=True)
+    login_time = Column(DateTime, default=datetime.utcnow, nullable=False)
+    logout_time = Column(DateTime, nullable=True)
@@ -0,0 +1,678 @@
+"""BSG (Betsoft) wallet callback endpoints.
+
+BSG calls back into us with the game token from the launch URL plus an MD5
+hash of token+PASS_KEY. authenticate is wired to sessions/wallets; the
+money-moving callbacks settle against the wallet row under FOR UPDATE with
+integer-cents arithmetic (see wallet_utils).
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import re
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple
+
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import BigInteger, and_, bindparam, cast, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...config import settings
+from ...db import AsyncSessionLocal, get_async_db
+from ...models import Player, UserSession, Wallet
+from .settings import get_bank_settings, resolve_bank_id
+from .token_cache import TokenCache
+from .wallet_utils import apply_delta_cents, fetch_locked_wallet_with_player
+from .xml.utils import _now_str, envelope_auth_ok, envelope_balance_ok, envelope_fail
+
+router = APIRouter(prefix="/betsoft", tags=["bsg"], default_response_class=ORJSONResponse)
+
+# Interned protocol/algo markers: dispatch compares pointers, not characters.
+_JSON = sys.intern("json")
+_XML = sys.intern("xml")
+_MD5 = sys.intern("md5")
+_BLAKE2B = sys.intern("blake2b-16")
+
+_token_cache = TokenCache(settings.REDIS_URL or None)
+
+# Game-session inserts are coalesced here and flushed by _session_writer so
+# a burst of authenticate calls shares one commit instead of one fsync each.
+_SESSION_Q: asyncio.Queue = asyncio.Queue()
+_FLUSH_MAX_ROWS = 100
+_FLUSH_INTERVAL = 0.02  # seconds
+_writer_task: asyncio.Task | None = None
+
+
+async def _session_writer() -> None:
+    stmt = pg_insert(UserSession.__table__).on_conflict_do_nothing(
+        index_elements=["token", "session_type", "provider"]
+    )
+    while True:
+        rows = [await _SESSION_Q.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _FLUSH_INTERVAL
+        while len(rows) < _FLUSH_MAX_ROWS:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                rows.append(await asyncio.wait_for(_SESSION_Q.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(stmt, rows)
+                await db.commit()
+        except Exception as exc:  # keep draining; a failed flush must not kill the writer
+            # one poison row fails the whole multi-row insert; retry per row
+            # so the rest of the batch still lands, and be loud about it —
+            # these are real game sessions, not debug chatter
+            _log.error(
+                "session writer batch flush failed (%d rows): %s; retrying per row",
+                len(rows),
+                exc,
+            )
+            for row in rows:
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(stmt, [row])
+                        await db.commit()
+                except Exception as row_exc:
+                    _log.error(
+                        "session row dropped (userId=%s): %s", row.get("userId"), row_exc
+                    )
+
+
+def start_session_writer() -> None:
+    global _writer_task
+    if _writer_task is None or _writer_task.done():
+        _writer_task = asyncio.create_task(_session_writer())
+    # let sync callers (logout in the threadpool) schedule L2 evictions
+    _token_cache.bind_loop(asyncio.get_running_loop())
+
+
+def _bank_protocol(bank) -> str:
+    return sys.intern((bank.BSG_PROTOCOL or "xml").lower())
+
+
+_log = logging.getLogger("bsg")
+_log.addHandler(logging.NullHandler())
+
+
+def debug(fmt: str, *args) -> None:
+    # %-style lazy formatting: args are only rendered when DEBUG is enabled,
+    # and nothing hits stdout from the request path
+    _log.debug(fmt, *args)
+
+
+# The protocol digest is md5(token + PASS_KEY) with the constant as the
+# suffix, so a pass-key-primed prefix state is not possible; instead a blank
+# primed state is copied (skipping hashlib's construction path and OpenSSL
+# 3's per-call provider fetch) and the two parts are fed separately, avoiding
+# the token+pass_key concat allocation. usedforsecurity=False also sidesteps
+# FIPS gating on hosts where MD5 is otherwise restricted.
+_MD5_BLANK = hashlib.new("md5", usedforsecurity=False)
+
+
+# BSG retries and duplicate deliveries replay identical (payload, hash)
+# pairs; the verification outcome is deterministic, so memoize the final
+# boolean rather than just the expected digest.
+@lru_cache(maxsize=4096)
+def _verify_sig(payload: str, their_hash: str, pass_key: bytes, algo: str = _MD5) -> bool:
+    if algo is _BLAKE2B or algo == "blake2b-16":
+        # keyed BLAKE2b: no concat at all, and ~2-3x faster than MD5 on
+        # 64-bit hosts for banks whose integration allows it
+        expected = hashlib.blake2b(payload.encode(), key=pass_key, digest_size=16).hexdigest()
+    else:
+        h = _MD5_BLANK.copy()
+        h.update(payload.encode())
+        h.update(pass_key)
+        expected = h.hexdigest()
+    # BSG sends lowercase hex in practice, so the first constant-time compare
+    # usually settles it without the .lower() allocation; the second compare
+    # keeps uppercase digests valid.
+    return hmac.compare_digest(expected, their_hash) or hmac.compare_digest(
+        expected, their_hash.lower()
+    )
+
+
+def _hash_ok(token: str, pass_key: bytes, their_hash: str | None, algo: str = _MD5) -> bool:
+    # both supported digests hex-encode to exactly 32 chars; junk that can't
+    # possibly match must not cost us a hash computation or cache slot
+    if not their_hash or len(their_hash) != 32:
+        return False
+    return _verify_sig(token, their_hash, pass_key, algo)
+
+
+def _echo_fields(token: str | None, hash_: str | None) -> dict:
+    return {"TOKEN": token or "", "HASH": hash_ or ""}
+
+
+@lru_cache(maxsize=8192)
+def _default_username(uid: int) -> str:
+    # fallback for players without a user_name; BSG re-asks for the same uid
+    # many times per round, so don't rebuild the string each call
+    return f"user_{uid}"
+
+
+# Hot statements are built once at import; SQLAlchemy's compiled cache then
+# keys on statement identity, so per-request SQL compilation disappears.
+# Balances are NUMERIC(18,2); casting balance*100 to BIGINT server-side hands
+# us minor units as a plain int and keeps Decimal off the hot path entirely.
+_WALLET_CENTS = cast(Wallet.balance * 100, BigInteger)
+
+_WALLET_STMT = select(_WALLET_CENTS).where(
+    Wallet.userId == bindparam("uid"), Wallet.currency_code == bindparam("cur")
+)
+
+# userId travels along so "no such player" (no row) stays distinguishable
+# from "player with a NULL user_name" (row with None in the second column)
+_ACCOUNT_USER_STMT = select(Player.userId, Player.user_name).where(
+    Player.userId == bindparam("uid")
+)
+
+_BAL_STMT = select(_WALLET_CENTS, Wallet.version).where(
+    Wallet.userId == bindparam("uid"), Wallet.currency_code == bindparam("cur")
+)
+
+_AUTH_STMT = (
+    select(UserSession.id, Player.user_name, _WALLET_CENTS)
+    .select_from(Player)
+    .outerjoin(
+        UserSession,
+        and_(
+            UserSession.userId == Player.userId,
+            UserSession.token == bindparam("tok"),
+            UserSession.session_type == "game",
+            UserSession.provider == "bsg",
+            UserSession.status == "active",
+        ),
+    )
+    .outerjoin(
+        Wallet,
+        and_(Wallet.userId == Player.userId, Wallet.currency_code == bindparam("cur")),
+    )
+    .where(Player.userId == bindparam("uid"))
+)
+
+
+# Balances only change through this service's own bet/refund/bonus handlers,
+# so a tiny TTL keeps the polling traffic off the DB while mutations evict
+# eagerly via invalidate_wallet. Single event loop: no lock needed.
+_BCACHE: TTLCache = TTLCache(maxsize=100_000, ttl=1.0)
+
+
+def invalidate_wallet(uid: int, currency_code: str) -> None:
+    """Drop the cached balance after a wallet mutation commits."""
+    _BCACHE.pop((uid, currency_code), None)
+
+
+async def _wallet_cents(db: AsyncSession, uid: int, currency_code: str) -> int:
+    key = (uid, currency_code)
+    cents = _BCACHE.get(key)
+    if cents is None:
+        cents = (await db.execute(_WALLET_STMT, {"uid": uid, "cur": currency_code})).scalar() or 0
+        _BCACHE[key] = cents
+    return cents
+
+
+_JSON_NO_USER = b'{"result": "failed", "code": 404, "reason": "user not found"}'
+_JSON_NO_WALLET = b'{"result": "failed", "code": 404, "reason": "wallet not found"}'
+_JSON_NO_FUNDS = b'{"result": "failed", "code": 300, "reason": "insufficient funds"}'
+
+
+# mirrors the wallets provisioned at signup (see routes.oauth_instagram)
+_BALANCE_CURRENCIES = ("USD", "VND")
+
+
+async def _balances_by_currency(uid: int, currencies=_BALANCE_CURRENCIES) -> dict[str, int]:
+    """Read several currency wallets concurrently.
+
+    One session per query so the round trips overlap; total latency is the
+    slowest read instead of the sum.
+    """
+
+    async def one(cur: str) -> tuple[str, int]:
+        async with AsyncSessionLocal() as db:
+            return cur, await _wallet_cents(db, uid, cur)
+
+    return dict(await asyncio.gather(*(one(c) for c in currencies)))
+
+
+# The error/OK envelopes only ever carry a handful of fixed (code, reason)
+# tuples; render them once at import and patch in the echo fields per call.
+_ECHO_PLACEHOLDERS = {"TOKEN": "__T__", "HASH": "__H__"}
+_TIME_RE = re.compile(rb"<TIME>.*?</TIME>")
+
+# table-driven escape for the opaque TOKEN/HASH echo values; the same token
+# is replayed across a whole game round, so remember its escaped form
+_XML_TAB = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&apos;"})
+
+
+@lru_cache(maxsize=4096)
+def _esc_echo(value: str) -> str:
+    return value.translate(_XML_TAB)
+
+
+def _freeze(xml: bytes) -> bytes:
+    return _TIME_RE.sub(b"<TIME>__TS__</TIME>", xml)
+
+
+_XML_MISSING = _freeze(envelope_fail(400, "missing token or hash", request_fields=_ECHO_PLACEHOLDERS))
+_XML_BAD_HASH = _freeze(envelope_fail(401, "invalid hash", request_fields=_ECHO_PLACEHOLDERS))
+_XML_BAD_TOKEN = _freeze(envelope_fail(401, "invalid token", request_fields=_ECHO_PLACEHOLDERS))
+# JSON-protocol counterparts are fully static - no echo block to patch.
+_JSON_MISSING = b'{"result": "failed", "code": 400, "reason": "missing token or hash"}'
+_JSON_BAD_HASH = b'{"result": "failed", "code": 401, "reason": "invalid hash"}'
+_JSON_BAD_TOKEN = b'{"result": "failed", "code": 401, "reason": "invalid token"}'
+
+
+def _json_static(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def _xml_from_template(tmpl: bytes, token: str | None, hash_: str | None) -> Response:
+    body = (
+        tmpl.replace(b"__T__", _esc_echo(token or "").encode())
+        .replace(b"__H__", _esc_echo(hash_ or "").encode())
+        .replace(b"__TS__", _now_str().encode())
+    )
+    return Response(content=body, media_type="application/xml")
+
+
+# Shared parameter declarations: Pydantic's Rust regex rejects malformed
+# values before any MD5 or DB work runs. hash is exactly 32 hex chars; token
+# is a JWT-shaped opaque string.
+_TOKEN_QUERY = Query(None, min_length=8, max_length=4096, pattern=r"^[A-Za-z0-9._~+/=-]+$")
+_HASH_QUERY = Query(None, alias="hash", min_length=32, max_length=32, pattern=r"^[0-9a-fA-F]{32}$")
+
+
+def missing_params_response(query: bytes = b"") -> Response:
+    """Missing-token/hash reply for the ASGI front gate in app.main.
+
+    Sniffs bankId out of the raw query string so JSON-protocol banks get
+    the same 200 + JSON failure body verify_bsg_request would produce;
+    anything unresolvable falls back to the XML envelope.
+    """
+    bank_id = None
+    idx = query.find(b"bankId=")
+    if idx != -1 and (idx == 0 or query[idx - 1 : idx] == b"&"):
+        end = query.find(b"&", idx)
+        raw = query[idx + 7 : end if end != -1 else len(query)]
+        if raw.isdigit():
+            bank_id = int(raw)
+    try:
+        bc = resolved_bank(bank_id)
+    except Exception:
+        return _xml_from_template(_XML_MISSING, None, None)
+    if bc.protocol is _JSON:
+        return _json_static(_JSON_MISSING)
+    return _xml_from_template(_XML_MISSING, None, None)
+
+
+class BankCtx(NamedTuple):
+    """Fused, immutable view of one bank's config for the request path.
+
+    protocol is pre-lowercased/interned and the pass key pre-encoded, so the
+    per-request cost is one lru_cache hit instead of repeated attribute
+    chases and string ops.
+    """
+
+    bank_id: int
+    bank: object
+    protocol: str
+    pass_key: str
+    pass_key_bytes: bytes
+    default_currency: str
+    hash_algo: str
+
+
+@lru_cache(maxsize=64)
+def _bank_ctx(bank_id: int) -> BankCtx:
+    bank = get_bank_settings(bank_id)
+    return BankCtx(
+        bank_id,
+        bank,
+        _bank_protocol(bank),
+        bank.BSG_PASS_KEY,
+        bank.pass_key_bytes,
+        bank.BSG_DEFAULT_CURRENCY or "USD",
+        sys.intern((bank.BSG_HASH_ALGO or "md5").lower()),
+    )
+
+
+def resolved_bank(bankId: int | None = None) -> BankCtx:
+    return _bank_ctx(resolve_bank_id(bankId))
+
+
+class BsgCtx(NamedTuple):
+    bank_id: int
+    bank: BankCtx
+    protocol: str
+    token: str
+    token_hash: str
+    payload: dict
+    uid: int
+
+
+class BsgAuthError(Exception):
+    """Raised from verify_bsg_request; carries the protocol-correct response."""
+
+    def __init__(self, response: Response):
+        self.response = response
+
+
+def _fail_response(protocol: str, json_body: bytes, token, hash_, xml_tmpl: bytes) -> Response:
+    if protocol is _JSON:
+        return _json_static(json_body)
+    return _xml_from_template(xml_tmpl, token, hash_)
+
+
+# BSG replays the same (token, hash) across all callbacks of a game round;
+# once a pair has passed MD5 + JWT verification, later calls are one lookup.
+# Only successes are cached; the TTL bounds staleness but says nothing about
+# token expiry, so each entry carries exp and hits re-check it.
+_VCACHE: TTLCache = TTLCache(maxsize=100_000, ttl=60)
+
+
+def invalidate_token(token: str) -> None:
+    """Evict a token everywhere when its session closes before exp.
+
+    Drops the token cache entry (L1 + shared L2) and any verified
+    (token, hash, bank) triples still sitting in _VCACHE; thread-safe to
+    call from sync routes.
+    """
+    _token_cache.invalidate(token)
+    for key in [k for k in _VCACHE.keys() if k[0] == token]:
+        _VCACHE.pop(key, None)
+
+
+async def verify_bsg_request(
+    token: str | None = _TOKEN_QUERY,
+    hash: str | None = _HASH_QUERY,
+    bankId: int | None = None,
+) -> BsgCtx:
+    """Shared token+hash+JWT preamble for the authenticated BSG endpoints."""
+    bc = resolved_bank(bankId)
+    bank_id = bc.bank_id
+    protocol = bc.protocol
+    if not token or not hash:
+        debug("BSG: missing token or hash (bankId=%s)", bank_id)
+        raise BsgAuthError(_fail_response(protocol, _JSON_MISSING, token, hash, _XML_MISSING))
+
+    vkey = (token, hash, bank_id)
+    hit = _VCACHE.get(vkey)
+    if hit is not None:
+        payload, uid, exp = hit
+        if exp > time.time():
+            return BsgCtx(bank_id, bc, protocol, token, hash, payload, uid)
+        _VCACHE.pop(vkey, None)  # expired mid-TTL; fall through to re-verify
+
+    if not _hash_ok(token, bc.pass_key_bytes, hash, bc.hash_algo):
+        debug("BSG: invalid hash for token=%r", token)
+        raise BsgAuthError(_fail_response(protocol, _JSON_BAD_HASH, token, hash, _XML_BAD_HASH))
+    payload = await _token_cache.get(token)
+    if payload is None:
+        debug("BSG: invalid token %r", token)
+        raise BsgAuthError(_fail_response(protocol, _JSON_BAD_TOKEN, token, hash, _XML_BAD_TOKEN))
+    uid = int(payload.get("uid") or payload.get("sub"))
+    _VCACHE[vkey] = (payload, uid, float(payload.get("exp") or 0.0))
+    return BsgCtx(bank_id, bc, protocol, token, hash, payload, uid)
+
+
+_ACCOUNT_RESPONSES: dict[int, tuple[str, bytes]] = {}
+
+
+def _build_account_response(bank_id: int, bank) -> tuple[str, bytes]:
+    """Pre-render the whole account body; only echo fields and username vary."""
+    if _bank_protocol(bank) is _JSON:
+        body = json.dumps(
+            {
+                "result": "ok",
+                "bankId": bank_id,
+                "username": "__U__",
+                "request": {"TOKEN": "__T__", "HASH": "__H__"},
+            },
+            separators=(",", ":"),
+        ).encode()
+        entry = ("application/json", body)
+    else:
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            "<EXTSYSTEM>"
+            "<REQUEST><TOKEN>__T__</TOKEN><HASH>__H__</HASH></REQUEST>"
+            "<TIME>__TS__</TIME>"
+            f"<RESPONSE><RESULT>ok</RESULT><BANKID>{bank_id}</BANKID>"
+            "<USERNAME>__U__</USERNAME></RESPONSE>"
+            "</EXTSYSTEM>"
+        )
+        entry = ("application/xml", xml.encode())
+    _ACCOUNT_RESPONSES[bank_id] = entry
+    return entry
+
+
+
+@router.get("/authenticate.do")
+async def authenticate(
+    ctx: BsgCtx = Depends(verify_bsg_request),
+    db: AsyncSession = Depends(get_async_db),
+):
+    uid = ctx.uid
+    token = ctx.token
+    req_fields = _echo_fields(token, ctx.token_hash)
+
+    # one round-trip for session existence, username and wallet balance
+    currency = ctx.bank.default_currency
+    row = (
+        await db.execute(_AUTH_STMT, {"uid": uid, "tok": token, "cur": currency})
+    ).first()
+    sess_id, user_name, balance_cents = row if row is not None else (None, None, None)
+    # row is None means the player itself is unknown; queueing a session for
+    # it would only poison the batched insert with an FK violation
+    if row is not None and sess_id is None:
+        # first authenticate for this launch token: record the game session.
+        # The insert is queued and batch-committed by _session_writer; the
+        # unique (token, session_type, provider) index keeps retries idempotent.
+        await _SESSION_Q.put(
+            {
+                "userId": uid,
+                "token": token,
+                "session_type": "game",
+                "provider": "bsg",
+                "status": "active",
+                "login_time": datetime.utcnow(),
+            }
+        )
+
+    username = user_name if user_name is not None else _default_username(uid)
+    if balance_cents is None:
+        balance_cents = 0
+
+    if ctx.protocol is _JSON:
+        return ORJSONResponse(
+            {
+                "result": "ok",
+                "userId": uid,
+                "username": username,
+                "currency": currency,
+                "balance": balance_cents,
+            }
+        )
+    return Response(
+        content=envelope_auth_ok(
+            req_fields,
+            user_id=uid,
+            username=username,
+            currency=currency,
+            balance_cents=balance_cents,
+        ),
+        media_type="application/xml",
+    )
+
+
+def _money_fail(ctx: BsgCtx, json_body: bytes, code: int, reason: str) -> Response:
+    if ctx.protocol is _JSON:
+        return _json_static(json_body)
+    return Response(
+        content=envelope_fail(code, reason, request_fields=_echo_fields(ctx.token, ctx.token_hash)),
+        media_type="application/xml",
+    )
+
+
+def _money_ok(ctx: BsgCtx, balance_cents: int) -> Response:
+    if ctx.protocol is _JSON:
+        return ORJSONResponse({"result": "ok", "balance": balance_cents})
+    return Response(
+        content=envelope_balance_ok(
+            _echo_fields(ctx.token, ctx.token_hash), balance_cents
+        ),
+        media_type="application/xml",
+    )
+
+
+async def _settle(ctx: BsgCtx, db: AsyncSession, delta_cents: int) -> Response:
+    """Apply a signed cents delta to the player's wallet and respond.
+
+    The wallet row is locked FOR UPDATE for the duration, the arithmetic is
+    plain int cents, and the balance cache entry is dropped after commit.
+    """
+    currency = ctx.bank.default_currency
+    wallet, player_exists = await fetch_locked_wallet_with_player(db, ctx.uid, currency)
+    if wallet is None:
+        if not player_exists:
+            return _money_fail(ctx, _JSON_NO_USER, 404, "user not found")
+        return _money_fail(ctx, _JSON_NO_WALLET, 404, "wallet not found")
+    if wallet.balance + delta_cents < 0:
+        return _money_fail(ctx, _JSON_NO_FUNDS, 300, "insufficient funds")
+    new_balance = apply_delta_cents(wallet, delta_cents)
+    await db.commit()
+    invalidate_wallet(ctx.uid, currency)
+    return _money_ok(ctx, new_balance)
+
+
+@router.get("/betResult.do")
+async def bet_result(
+    ctx: BsgCtx = Depends(verify_bsg_request),
+    bet: int | None = None,
+    win: int | None = None,
+    casinoTransactionId: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _settle(ctx, db, (win or 0) - (bet or 0))
+
+
+@router.get("/refundBet.do")
+async def refund_bet(
+    ctx: BsgCtx = Depends(verify_bsg_request),
+    amount: int | None = None,
+    casinoTransactionId: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _settle(ctx, db, amount or 0)
+
+
+@router.get("/getBalance.do")
+async def balance(
+    request: Request,
+    ctx: BsgCtx = Depends(verify_bsg_request),
+    db: AsyncSession = Depends(get_async_db),
+):
+    uid = ctx.uid
+    currency = ctx.bank.default_currency
+    row = (await db.execute(_BAL_STMT, {"uid": uid, "cur": currency})).first()
+    cents, version = row if row is not None else (0, 0)
+
+    # BSG polls getBalance between rounds with funds usually unchanged; the
+    # wallet version gives us a cheap validator so a repeat poll is a header
+    # compare instead of a rendered body.
+    etag = f'W/"{uid}-{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if ctx.protocol is _JSON:
+        return ORJSONResponse(
+            {
+                "result": "ok",
+                "userId": uid,
+                "currency": currency,
+                "balance": cents,
+                "wallets": await _balances_by_currency(uid),
+            },
+            headers={"ETag": etag},
+        )
+    return Response(
+        content=envelope_balance_ok(_echo_fields(ctx.token, ctx.token_hash), cents),
+        media_type="application/xml",
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/bonusWin.do")
+async def bonus_win(
+    ctx: BsgCtx = Depends(verify_bsg_request),
+    amount: int | None = None,
+    casinoTransactionId: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _settle(ctx, db, amount or 0)
+
+
+@router.get("/bonusRelease.do")
+async def bonus_release(
+    ctx: BsgCtx = Depends(verify_bsg_request),
+    amount: int | None = None,
+    casinoTransactionId: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _settle(ctx, db, amount or 0)
+
+
+@router.get("/getAccount.do")
+async def account_info(
+    token: str | None = _TOKEN_QUERY,
+    hash: str | None = _HASH_QUERY,
+    userId: int | None = None,
+    bankId: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    bc = resolved_bank(bankId)
+    username = ""
+    if userId is not None:
+        # two columns, no Player hydration; a missing row is the 404 signal
+        row = (await db.execute(_ACCOUNT_USER_STMT, {"uid": userId})).first()
+        if row is None:
+            if bc.protocol is _JSON:
+                return _json_static(
+                    b'{"result": "failed", "code": 404, "reason": "user not found"}'
+                )
+            return Response(
+                content=envelope_fail(404, "user not found", request_fields=_echo_fields(token, hash)),
+                media_type="application/xml",
+            )
+        username = row[1] if row[1] is not None else _default_username(row[0])
+    entry = _ACCOUNT_RESPONSES.get(bc.bank_id)
+    if entry is None:
+        entry = _build_account_response(bc.bank_id, bc.bank)
+    media_type, tmpl = entry
+    if media_type == "application/json":
+        body = (
+            tmpl.replace(b"__T__", json.dumps(token or "")[1:-1].encode())
+            .replace(b"__H__", json.dumps(hash or "")[1:-1].encode())
+            .replace(b"__U__", json.dumps(username)[1:-1].encode())
+        )
+    else:
+        body = (
+            tmpl.replace(b"__T__", _esc_echo(token or "").encode())
+            .replace(b"__H__", _esc_echo(hash or "").encode())
+            .replace(b"__U__", _esc_echo(username).encode())
+            .replace(b"__TS__", _now_str().encode())
+        )
+    return Response(content=body, media_type=media_type)
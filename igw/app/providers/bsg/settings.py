@@ -0,0 +1,96 @@
+"""Per-bank BSG settings.
+
+Each configured bank lives in igw/banks/<bank_id>/.env with its own
+BSG_PASS_KEY, protocol etc. A bank id can be omitted in requests when
+exactly one bank is configured.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+BANKS_DIR = Path(__file__).resolve().parents[3] / "banks"
+
+
+@dataclass(frozen=True, slots=True)
+class BankCfg:
+    """One bank's config, parsed once from its .env.
+
+    Frozen with slots: attribute reads on the request path are plain slot
+    loads, and the derived pass_key_bytes is materialized at construction
+    instead of per call. Signature verification itself lives in
+    router._verify_sig, which consumes pass_key_bytes directly.
+    """
+
+    BSG_BANK_ID: int
+    BSG_PASS_KEY: str
+    BSG_PROTOCOL: str = "xml"  # xml | json
+    BSG_HASH_ALGO: str = "md5"  # md5 | blake2b-16 (for banks off the stock protocol)
+    BSG_DEFAULT_CURRENCY: str = "USD"
+    BSG_DEFAULT_GAME_ID: int = 0
+    BSG_API_BASE: str = ""
+    pass_key_bytes: bytes = b""
+
+
+# Bank directories change on deploys, not at request rate; rescan at most
+# every 30s and answer default-bank resolution from the cached list.
+_BANKS_TTL = 30.0
+_banks_cache: tuple[float, list[int]] = (0.0, [])
+
+
+def list_available_banks() -> list[int]:
+    global _banks_cache
+    stamp, banks = _banks_cache
+    now = time.monotonic()
+    if now - stamp >= _BANKS_TTL:
+        banks = []
+        try:
+            with os.scandir(BANKS_DIR) as it:
+                banks = sorted(
+                    int(e.name)
+                    for e in it
+                    if e.name.isdigit()
+                    and e.is_dir(follow_symlinks=False)
+                    and os.path.exists(os.path.join(e.path, ".env"))
+                )
+        except FileNotFoundError:
+            pass
+        _banks_cache = (now, banks)
+    return banks
+
+
+def resolve_bank_id(bank_id: int | None) -> int:
+    """Return the bank id to use for a request, defaulting to the only one.
+
+    Deliberately uncached: the explicit case is a trivial int(), and the
+    default case must track list_available_banks()'s 30s rescan so adding a
+    second bank to a live process starts requiring bankId again.
+    """
+    if bank_id is not None:
+        return int(bank_id)
+    banks = list_available_banks()
+    if len(banks) == 1:
+        return banks[0]
+    raise ValueError("bankId is required when multiple banks are configured")
+
+
+@lru_cache(maxsize=64)
+def get_bank_settings(bank_id: int) -> BankCfg:
+    # cached per bank id; call get_bank_settings.cache_clear() after editing
+    # a bank .env on a live process
+    vals = dotenv_values(BANKS_DIR / str(bank_id) / ".env")
+    pass_key = vals.get("BSG_PASS_KEY") or ""
+    return BankCfg(
+        BSG_BANK_ID=int(vals.get("BSG_BANK_ID") or bank_id),
+        BSG_PASS_KEY=pass_key,
+        BSG_PROTOCOL=vals.get("BSG_PROTOCOL") or "xml",
+        BSG_HASH_ALGO=vals.get("BSG_HASH_ALGO") or "md5",
+        BSG_DEFAULT_CURRENCY=vals.get("BSG_DEFAULT_CURRENCY") or "USD",
+        BSG_DEFAULT_GAME_ID=int(vals.get("BSG_DEFAULT_GAME_ID") or 0),
+        BSG_API_BASE=vals.get("BSG_API_BASE") or "",
+        pass_key_bytes=pass_key.encode(),
+    )
@@ -0,0 +1,126 @@
+"""Two-level cache for BSG launch-token validation.
+
+L1 is a small in-process LRU; L2 is an optional shared Redis so freshly
+restarted or scaled-out workers don't all re-pay the JWT verification cost
+for tokens another worker already validated. Only successful validations
+are cached, with a TTL bounded by the token's own exp claim.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # redis is optional; fall back to the in-process L1 only
+    aioredis = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from ...utils.security import TokenError, decode_token
+
+
+def _pack(payload: dict) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _unpack(raw: bytes) -> dict:
+    if msgpack is not None:
+        return msgpack.unpackb(raw)
+    return json.loads(raw)
+
+
+class TokenCache:
+    def __init__(self, redis_url: str | None = None, l1_size: int = 10_000):
+        self._l1: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._l1_size = l1_size
+        self._l2 = aioredis.from_url(redis_url) if (redis_url and aioredis is not None) else None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Remember the serving event loop so sync callers can reach L2.
+
+        Called once at startup; threadpool code (the logout route) has no
+        running loop of its own to schedule the Redis delete on.
+        """
+        self._loop = loop
+
+    @staticmethod
+    def _key(token: str) -> str:
+        # short fingerprint, never the raw JWT, as the shared-store key;
+        # blake2b is faster than sha256 here and this is not wire-compat MD5
+        return "bsg:tok:" + hashlib.blake2b(
+            token.encode(), digest_size=16, usedforsecurity=False
+        ).hexdigest()
+
+    def _store_l1(self, token: str, exp: float, payload: dict) -> None:
+        self._l1[token] = (exp, payload)
+        self._l1.move_to_end(token)
+        while len(self._l1) > self._l1_size:
+            self._l1.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """Evict a token, e.g. when its session is closed before exp.
+
+        Callable from sync (threadpool) code: L1 is dropped inline and the
+        L2 delete is scheduled on the current loop when there is one, else
+        thread-safely on the loop captured at startup via bind_loop.
+        """
+        self._l1.pop(token, None)
+        if self._l2 is None:
+            return
+        coro = self._l2.delete(self._key(token))
+        try:
+            asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            if self._loop is not None and not self._loop.is_closed():
+                asyncio.run_coroutine_threadsafe(coro, self._loop)
+            else:
+                coro.close()  # no loop to run on; entry ages out with its TTL
+
+    async def get(self, token: str) -> dict | None:
+        """Return the verified claims for token, or None if invalid."""
+        now = time.time()
+
+        hit = self._l1.get(token)
+        if hit is not None:
+            exp, payload = hit
+            if exp > now:
+                self._l1.move_to_end(token)
+                return payload
+            del self._l1[token]
+
+        if self._l2 is not None:
+            try:
+                raw = await self._l2.get(self._key(token))
+            except Exception:
+                raw = None  # Redis being down must not fail validation
+            if raw is not None:
+                payload = _unpack(raw)
+                exp = float(payload.get("exp") or now)
+                if exp > now:
+                    self._store_l1(token, exp, payload)
+                    return payload
+
+        try:
+            payload = decode_token(token)
+        except TokenError:
+            return None
+
+        exp = float(payload.get("exp") or now)
+        ttl = int(exp - now)
+        if ttl > 0:
+            self._store_l1(token, exp, payload)
+            if self._l2 is not None:
+                try:
+                    await self._l2.set(self._key(token), _pack(payload), ex=ttl)
+                except Exception:
+                    pass
+        return payload
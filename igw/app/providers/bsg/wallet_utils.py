@@ -0,0 +1,62 @@
+"""Wallet helpers for the money-moving BSG callbacks.
+
+Balances are integer minor units in Python (see models.CentsInt); the
+helpers here lock the wallet row for the duration of the mutation and do
+plain int arithmetic — no Decimal on the hot path.
+"""
+
+from cachetools import LRUCache
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models import Player, Wallet
+
+# Happy path is one statement: the inner join to players both proves the
+# player exists and locks the wallet row. (FOR UPDATE cannot lock the
+# nullable side of an outer join, so the no-wallet case falls back to a
+# scalar existence probe — failure-path only.)
+_WALLET_JOIN_FOR_UPDATE = (
+    select(Wallet)
+    .join(Player, Player.userId == Wallet.userId)
+    .where(Wallet.userId == bindparam("uid"), Wallet.currency_code == bindparam("cur"))
+    .with_for_update(of=Wallet)
+)
+
+_PLAYER_EXISTS = select(Player.userId).where(Player.userId == bindparam("uid"))
+
+# (uid, currency) -> wallet_id. Wallet ids never change once created, so hot
+# users skip the join and go straight to a PK get (the cheapest fetch there
+# is); entries for deleted wallets self-heal on the next miss.
+_wallet_ids: LRUCache = LRUCache(maxsize=100_000)
+
+
+async def fetch_locked_wallet_with_player(
+    db: AsyncSession, uid: int, currency_code: str
+) -> tuple[Wallet | None, bool]:
+    """Locked wallet plus player existence in one round trip.
+
+    Returns (wallet, player_exists); the extra existence probe only runs
+    when the wallet is missing, so settled bets never pay for it.
+    """
+    key = (uid, currency_code)
+    wid = _wallet_ids.get(key)
+    if wid is not None:
+        wallet = await db.get(Wallet, wid, with_for_update=True)
+        if wallet is not None:
+            return wallet, True
+        _wallet_ids.pop(key, None)
+    wallet = (
+        await db.execute(_WALLET_JOIN_FOR_UPDATE, {"uid": uid, "cur": currency_code})
+    ).scalar_one_or_none()
+    if wallet is not None:
+        _wallet_ids[key] = wallet.wallet_id
+        return wallet, True
+    exists = (await db.execute(_PLAYER_EXISTS, {"uid": uid})).scalar() is not None
+    return None, exists
+
+
+def apply_delta_cents(wallet: Wallet, delta_cents: int) -> int:
+    """Apply a signed cents delta and bump the version; returns the new balance."""
+    wallet.balance += delta_cents
+    wallet.version += 1
+    return wallet.balance
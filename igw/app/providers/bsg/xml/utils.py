@@ -0,0 +1,179 @@
+"""EXTSYSTEM envelope builders for the BSG wallet protocol (XML flavor)."""
+
+import re
+import sys
+import time
+from functools import lru_cache
+
+# The TIME field has one-second resolution, so every response within the
+# same second reuses one formatted string; tuple swap is atomic under the GIL.
+_TS_CACHE: tuple[int, str] = (0, "")
+
+# English month abbreviations, indexed by tm_mon. The protocol's TIME field
+# is locale-independent, so %b (which consults the locale) is out; formatting
+# off the gmtime struct with this table keeps the output fixed.
+_MONS = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+         "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _now_str() -> str:
+    global _TS_CACHE
+    t = int(time.time())
+    cached = _TS_CACHE
+    if t != cached[0]:
+        g = time.gmtime(t)
+        s = (
+            f"{g.tm_mday:02d} {_MONS[g.tm_mon]} {g.tm_year} "
+            f"{g.tm_hour:02d}:{g.tm_min:02d}:{g.tm_sec:02d}"
+        )
+        cached = _TS_CACHE = (t, s)
+    return cached[1]
+
+
+_ESC_RE = re.compile(r"[&<>\"']")
+_ESC_MAP = {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&apos;"}
+_esc_sub = _ESC_RE.sub
+_esc_search = _ESC_RE.search
+
+
+def _esc_char(m, _get=_ESC_MAP.__getitem__) -> str:
+    return _get(m.group(0))
+
+
+def _escape(value) -> str:
+    # ids, hashes and currency codes — the bulk of envelope fields — contain
+    # nothing escapable, so a C-level scan returns the input untouched; only
+    # strings that actually need it pay for the substitution pass
+    s = str(value)
+    if _esc_search(s) is None:
+        return s
+    return _esc_sub(_esc_char, s)
+
+
+# The protocol's echo keys form a small closed set; precompute their open
+# and close fragments (indentation included) as interned constants so tag
+# emission is three list appends with no formatting at all.
+_KNOWN_ECHO_KEYS = (
+    "TOKEN",
+    "HASH",
+    "USERID",
+    "CASINOTRANSACTIONID",
+    "EXTSYSTEMTRANSACTIONID",
+    "BANKID",
+    "CURRENCY",
+)
+_OPEN = {k: sys.intern(f"    <{k}>") for k in _KNOWN_ECHO_KEYS}
+_CLOSE = {k: sys.intern(f"</{k}>\n") for k in _KNOWN_ECHO_KEYS}
+_open_get = _OPEN.get
+_close_get = _CLOSE.get
+
+
+@lru_cache(maxsize=4096)
+def _render_items(items: tuple) -> str:
+    # flat fragment appends + one join: no per-field f-string temporaries,
+    # one final allocation for the whole block
+    parts = ["  <REQUEST>\n"]
+    append = parts.append
+    for k, v in items:
+        append(_open_get(k) or f"    <{k}>")
+        append(_escape(v))
+        append(_close_get(k) or f"</{k}>\n")
+    append("  </REQUEST>")
+    return "".join(parts)
+
+
+def _render_request_fields(fields: dict[str, str] | None) -> str:
+    """Render the <REQUEST> echo block.
+
+    Takes a dict of already-uppercase tag names to string values — the only
+    shape the router produces. Rendering is memoized on the field contents:
+    a failure path builds the same TOKEN/HASH echo more than once per
+    request, and BSG retries replay identical pairs across requests.
+    """
+    if not fields:
+        return "  <REQUEST/>"
+    return _render_items(tuple(fields.items()))
+
+
+# Envelope skeletons as module-level templates: adjacent literals fold into
+# one constant at compile time, so each builder does a single format pass
+# instead of re-joining ~10 fragments per call.
+_AUTH_OK_TMPL = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    "<EXTSYSTEM>\n"
+    "{req}\n"
+    "  <TIME>{t}</TIME>\n"
+    "  <RESPONSE>\n"
+    "    <RESULT>OK</RESULT>\n"
+    "    <USERID>{uid}</USERID>\n"
+    "    <USERNAME>{username}</USERNAME>\n"
+    "    <CURRENCY>{currency}</CURRENCY>\n"
+    "    <BALANCE>{bal}</BALANCE>\n"
+    "  </RESPONSE>\n"
+    "</EXTSYSTEM>"
+)
+
+_BALANCE_OK_TMPL = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    "<EXTSYSTEM>\n"
+    "{req}\n"
+    "  <TIME>{t}</TIME>\n"
+    "  <RESPONSE>\n"
+    "    <RESULT>OK</RESULT>\n"
+    "    <BALANCE>{bal}</BALANCE>\n"
+    "  </RESPONSE>\n"
+    "</EXTSYSTEM>"
+)
+
+_FAIL_TMPL = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    "<EXTSYSTEM>\n"
+    "{req}\n"
+    "  <TIME>{t}</TIME>\n"
+    "  <RESPONSE>\n"
+    "    <RESULT>FAILED</RESULT>\n"
+    "    <CODE>{code}</CODE>\n"
+    "    <REASON>{reason}</REASON>\n"
+    "  </RESPONSE>\n"
+    "</EXTSYSTEM>"
+)
+
+
+def envelope_auth_ok(
+    request_fields: dict[str, str],
+    user_id: int,
+    username: str,
+    currency: str,
+    balance_cents: int,
+) -> bytes:
+    """Authenticate-shaped OK envelope, UTF-8 encoded ready for Response.
+
+    user_id and balance_cents must already be ints (the router guarantees
+    this), so they format without escape or defensive coercion.
+    """
+    return _AUTH_OK_TMPL.format(
+        req=_render_request_fields(request_fields),
+        t=_now_str(),
+        uid=user_id,
+        username=_escape(username),
+        currency=_escape(currency),
+        bal=balance_cents,
+    ).encode()
+
+
+def envelope_balance_ok(request_fields: dict[str, str], balance_cents: int) -> bytes:
+    """Balance-only OK envelope: bet/refund/bonus settlements and getBalance."""
+    return _BALANCE_OK_TMPL.format(
+        req=_render_request_fields(request_fields),
+        t=_now_str(),
+        bal=balance_cents,
+    ).encode()
+
+
+def envelope_fail(code: int, reason: str, request_fields=None) -> bytes:
+    return _FAIL_TMPL.format(
+        req=_render_request_fields(request_fields),
+        t=_now_str(),
+        code=code,
+        reason=_escape(reason),
+    ).encode()
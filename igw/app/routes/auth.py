@@ -0,0 +1,124 @@
+"""Email/password registration and logout for app sessions."""
+
+from datetime import datetime
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from pydantic import BaseModel
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..models import Player, UserSession
+from ..providers.bsg.router import invalidate_token
+from ..utils.ip import client_ip
+from ..utils.security import TokenError, create_token, decode_token, hash_password
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@lru_cache(maxsize=512)
+def _decode(token: str) -> dict:
+    """decode_token with the HMAC verification memoized per token.
+
+    Clients retry logout on flaky mobile networks; the payload is immutable
+    token content, and whether the session is still active is decided against
+    the database below, so stale entries are harmless and need no eviction.
+    lru_cache does not store raised exceptions, so bad tokens are re-checked.
+    """
+    return decode_token(token)
+
+
+class RegisterRequest(BaseModel):
+    email: str
+    password: str
+    user_name: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    # server-driven flows create the account now and log in later; skipping
+    # the JWT (HMAC sign + base64) and the session row when nobody will use
+    # them keeps that path cheap
+    issue_token: bool = True
+
+
+class RegisterResponse(BaseModel):
+    user_id: int
+    email: str
+    token: str | None = None
+
+
+@router.post("/register", response_model=RegisterResponse)
+def register(req: RegisterRequest, request: Request, db: Session = Depends(get_db)):
+    # EXISTS returns a bare boolean: no all-column SELECT, no Player
+    # hydration just to test presence (players.email is unique-indexed)
+    if db.scalar(select(exists().where(Player.email == req.email))):
+        raise HTTPException(status_code=409, detail="email already registered")
+
+    # Core INSERT .. RETURNING: the generated userId comes back from the
+    # insert itself, so there is no early flush round-trip and no ORM
+    # identity-map bookkeeping for rows nobody reads back
+    uid = db.execute(
+        insert(Player)
+        .values(
+            email=req.email,
+            password_hash=hash_password(req.password),
+            user_name=req.user_name or req.email.split("@")[0],
+            first_name=req.first_name,
+            last_name=req.last_name,
+        )
+        .returning(Player.userId)
+    ).scalar_one()
+
+    token = None
+    if req.issue_token:
+        token = create_token({"uid": uid, "sub": str(uid)})
+        db.execute(
+            insert(UserSession).values(
+                userId=uid,
+                token=token,
+                session_type="app",
+                provider="local",
+                status="active",
+                ip=client_ip(request),
+                user_agent=request.headers.get("user-agent"),
+            )
+        )
+    db.commit()
+    return RegisterResponse(user_id=uid, email=req.email, token=token)
+
+
+@router.post("/logout")
+def logout(authorization: str | None = Header(None), db: Session = Depends(get_db)):
+    # lowercase only the 7-char prefix instead of copying the whole header
+    # (the JWT dominates its length), then slice the token out directly
+    hdr = authorization or ""
+    if len(hdr) < 8 or hdr[:7].lower() != "bearer ":
+        raise HTTPException(status_code=400, detail="Missing bearer token")
+    token = hdr[7:].strip()
+
+    try:
+        payload = _decode(token)
+    except TokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    uid = int(payload.get("uid") or payload.get("sub"))
+
+    # one UPDATE..RETURNING instead of SELECT-then-mutate: the DB does the
+    # "is there an active session" branch and we learn the outcome from the
+    # returned row, halving the round-trips per logout
+    closed = db.execute(
+        update(UserSession)
+        .where(
+            UserSession.userId == uid,
+            UserSession.token == token,
+            UserSession.status == "active",
+        )
+        .values(status="logged_out", logout_time=datetime.utcnow())
+        .returning(UserSession.id)
+    ).first()
+    db.commit()
+    if closed is not None:
+        # a token cached as valid by the BSG path must not outlive its
+        # session — drop it from the token cache and the verified-pair cache
+        invalidate_token(token)
+    # idempotent: logging out twice is fine
+    return {"result": "ok"}
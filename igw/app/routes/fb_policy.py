@@ -0,0 +1,31 @@
+"""Meta platform policy webhooks: deauthorize + data deletion callbacks."""
+
+import uuid
+
+from fastapi import APIRouter, Response
+from fastapi.responses import ORJSONResponse
+
+from ..config import settings
+
+router = APIRouter(prefix="/fb", tags=["fb-policy"])
+
+# Meta retries these webhooks in bursts; the deauth body never changes, so
+# serialize it once at import and replay the bytes.
+_DEAUTH_BYTES = b'{"status":"received"}'
+
+
+@router.post("/deauth")
+def deauthorize():
+    # Meta only checks for a 200; we don't keep IG tokens server-side.
+    return Response(content=_DEAUTH_BYTES, media_type="application/json")
+
+
+@router.post("/delete")
+def data_deletion():
+    confirmation_code = uuid.uuid4().hex
+    return ORJSONResponse(
+        {
+            "url": f"{settings.APP_BASE_URL}/fb/deletion-status?code={confirmation_code}",
+            "confirmation_code": confirmation_code,
+        }
+    )
@@ -0,0 +1,246 @@
+"""Instagram Business Login flow: /oauth/instagram/start and /callback.
+
+start redirects the browser to Instagram's authorize page; callback exchanges
+the one-time code for an Instagram access token, fetches the profile, upserts
+the Player (+ USD/VND wallets on first login) and mints our own app JWT.
+"""
+
+import asyncio
+from html import escape
+from string import Template
+from urllib.parse import urlencode
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, RedirectResponse
+from sqlalchemy import and_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db import get_db
+from ..http_clients import get_ig_client
+from ..models import Player, Wallet
+from ..utils.security import create_token
+
+router = APIRouter(prefix="/oauth/instagram", tags=["oauth"])
+
+AUTHORIZE_URL = "https://www.instagram.com/oauth/authorize"
+TOKEN_URL = "https://api.instagram.com/oauth/access_token"
+GRAPH_ME_URL = "https://graph.instagram.com/me"
+
+WALLET_CURRENCIES = ("USD", "VND")
+
+
+@router.get("/start")
+def instagram_start():
+    params = {
+        "client_id": settings.IG_CLIENT_ID,
+        "redirect_uri": settings.IG_REDIRECT_URI,
+        "scope": settings.IG_SCOPES,
+        "response_type": "code",
+    }
+    return RedirectResponse(f"{AUTHORIZE_URL}?{urlencode(params)}")
+
+
+def ensure_wallets_for_user(db: Session, user_id: int, have=frozenset()) -> None:
+    """Create the default USD/VND wallets on first login if missing.
+
+    have is the set of currency codes the player already owns.
+    """
+    for cur in WALLET_CURRENCIES:
+        if cur not in have:
+            db.add(Wallet(userId=user_id, currency_code=cur, balance=0))
+
+
+@router.get("/callback")
+async def instagram_callback(
+    request: Request,
+    code: str | None = None,
+    db: Session = Depends(get_db),
+    cx: httpx.AsyncClient = Depends(get_ig_client),
+):
+    if not code:
+        raise HTTPException(status_code=400, detail="missing code")
+
+    token_res = await cx.post(
+        TOKEN_URL,
+        data={
+            "client_id": settings.IG_CLIENT_ID,
+            "client_secret": settings.IG_CLIENT_SECRET,
+            "grant_type": "authorization_code",
+            "redirect_uri": settings.IG_REDIRECT_URI,
+            "code": code,
+        },
+    )
+    if token_res.status_code != 200:
+        raise HTTPException(status_code=502, detail="token exchange failed")
+    token_data = token_res.json()
+    ig_access_token = token_data["access_token"]
+
+    # the token response already names the IG user; start the wallet-state
+    # lookup (player id + owned currencies in one joined select) in the
+    # threadpool now so the DB round-trip hides behind the /me call instead
+    # of queueing after it
+    def _load_wallet_state(ext_id: str):
+        return db.execute(
+            select(Player.userId, Wallet.currency_code)
+            .outerjoin(
+                Wallet,
+                and_(
+                    Wallet.userId == Player.userId,
+                    Wallet.currency_code.in_(WALLET_CURRENCIES),
+                ),
+            )
+            .where(Player.ext_user_id == ext_id)
+        ).all()
+
+    token_uid = token_data.get("user_id")
+    player_task = (
+        asyncio.create_task(run_in_threadpool(_load_wallet_state, str(token_uid)))
+        if token_uid is not None
+        else None
+    )
+
+    me_res = await cx.get(
+        GRAPH_ME_URL,
+        params={"fields": "id,username", "access_token": ig_access_token},
+    )
+    if me_res.status_code != 200:
+        # let the prefetch finish before raising: cancelling wouldn't stop
+        # the threadpool query, and the get_db teardown would then close the
+        # (not thread-safe) Session under a still-running statement
+        if player_task is not None:
+            try:
+                await player_task
+            except Exception:
+                pass
+        raise HTTPException(status_code=502, detail="profile fetch failed")
+    me = me_res.json()
+
+    ig_id = str(me["id"])
+    username = me.get("username") or f"ig_{ig_id}"
+
+    prefetched = None
+    looked_up = False
+    if player_task is not None:
+        prefetched = await player_task
+        # trust the prefetch only when the token's user_id and the profile
+        # id agree (they always should); otherwise fall back to a fresh read
+        looked_up = str(token_uid) == ig_id
+
+    # the player upsert runs on the sync engine; do it in the threadpool as
+    # one closure (a single thread hop) so the event loop keeps serving the
+    # BSG callbacks while this commits. INSERT .. ON CONFLICT .. RETURNING
+    # replaces the old SELECT + conditional INSERT + flush, so the common
+    # path is one upsert (wallet state came with the prefetch) + commit.
+    def _upsert_player() -> tuple[int, str]:
+        uid = db.execute(
+            pg_insert(Player)
+            .values(
+                ext_user_id=ig_id,
+                user_name=username,
+                email=f"{username}@instagram.com",  # temporary until the user sets one
+            )
+            .on_conflict_do_update(
+                index_elements=[Player.ext_user_id],
+                set_={"user_name": username},
+            )
+            .returning(Player.userId)
+        ).scalar_one()
+
+        if looked_up and (not prefetched or prefetched[0][0] == uid):
+            have = {cur for _, cur in prefetched if cur is not None}
+        else:
+            have = set(
+                db.scalars(
+                    select(Wallet.currency_code).where(
+                        Wallet.userId == uid,
+                        Wallet.currency_code.in_(WALLET_CURRENCIES),
+                    )
+                )
+            )
+        ensure_wallets_for_user(db, uid, have)
+        db.commit()
+        return uid, create_token({"uid": uid, "sub": str(uid)})
+
+    user_id, token = await run_in_threadpool(_upsert_player)
+
+    return HTMLResponse(
+        _SUCCESS_TPL.substitute(
+            # username comes from Instagram, i.e. is user-controlled; escape
+            # it (and the token, defensively) so it can't inject markup
+            username=escape(username),
+            user_id=user_id,
+            token=escape(token),
+        )
+    )
+
+
+# Parsed once at import; per-request work is a substitution over the
+# pre-split template instead of re-interpolating a multi-KB f-string.
+_SUCCESS_TPL = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Login successful</title>
+<style>
+  body {
+    margin: 0;
+    font-family: "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+    background: linear-gradient(135deg, #833ab4, #fd1d1d, #fcb045);
+    min-height: 100vh;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+  }
+  .card {
+    background: #fff;
+    border-radius: 16px;
+    box-shadow: 0 12px 40px rgba(0, 0, 0, 0.25);
+    padding: 40px 48px;
+    max-width: 560px;
+    text-align: center;
+  }
+  .card h1 {
+    margin: 0 0 8px;
+    font-size: 28px;
+    color: #262626;
+  }
+  .card p {
+    color: #666;
+    margin: 4px 0;
+  }
+  .username {
+    font-weight: 600;
+    color: #833ab4;
+  }
+  .token {
+    margin-top: 20px;
+    padding: 12px;
+    background: #fafafa;
+    border: 1px solid #eee;
+    border-radius: 8px;
+    font-family: monospace;
+    font-size: 12px;
+    word-break: break-all;
+    color: #444;
+  }
+  .hint {
+    margin-top: 16px;
+    font-size: 13px;
+    color: #999;
+  }
+</style>
+</head>
+<body>
+  <div class="card">
+    <h1>Welcome, <span class="username">$username</span>!</h1>
+    <p>User id: $user_id</p>
+    <p>You are now logged in through Instagram.</p>
+    <div class="token">$token</div>
+    <p class="hint">Use this token in your game launch URL.</p>
+  </div>
+</body>
+</html>""")
@@ -0,0 +1,13 @@
+"""Helpers to capture the client IP (ngrok / proxy aware)."""
+
+from fastapi import Request
+
+
+def client_ip(request: Request) -> str | None:
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        # first hop is the original client
+        return forwarded.split(",")[0].strip()
+    if request.client:
+        return request.client.host
+    return None
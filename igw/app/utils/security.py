@@ -0,0 +1,42 @@
+"""JWT creation/validation and password hashing. Central place for crypto."""
+
+from datetime import datetime, timedelta
+
+import jwt
+from passlib.context import CryptContext
+
+from ..config import settings
+
+ALGORITHM = "HS256"
+
+# single exception surface for callers; PyJWT's HS256 path is measurably
+# faster than python-jose's
+TokenError = jwt.InvalidTokenError
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def create_token(payload: dict, ttl_seconds: int | None = None) -> str:
+    """Mint an app JWT signed with JWT_SIGNING_KEY.
+
+    The caller supplies the claims (e.g. uid/sub); iat/exp are added here.
+    """
+    ttl = ttl_seconds if ttl_seconds is not None else settings.JWT_TTL_SECONDS
+    now = datetime.utcnow()
+    claims = dict(payload)
+    claims["iat"] = now
+    claims["exp"] = now + timedelta(seconds=ttl)
+    return jwt.encode(claims, settings.JWT_SIGNING_KEY, algorithm=ALGORITHM)
+
+
+def decode_token(token: str) -> dict:
+    """Verify signature + expiry and return the claims. Raises TokenError."""
+    return jwt.decode(token, settings.JWT_SIGNING_KEY, algorithms=[ALGORITHM])
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    return pwd_context.verify(password, password_hash)
@@ -0,0 +1,41 @@
+-- Schema for the IGW database (kept in sync with igw/app/models.py).
+
+CREATE TABLE IF NOT EXISTS players (
+    "userId"      SERIAL PRIMARY KEY,
+    ext_user_id   VARCHAR(64) UNIQUE,
+    user_name     VARCHAR(128),
+    email         VARCHAR(255) UNIQUE,
+    password_hash VARCHAR(128),
+    first_name    VARCHAR(128),
+    last_name     VARCHAR(128),
+    created_at    TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS wallets (
+    wallet_id     SERIAL PRIMARY KEY,
+    "userId"      INTEGER NOT NULL REFERENCES players ("userId"),
+    currency_code VARCHAR(3) NOT NULL,
+    balance       NUMERIC(18, 2) NOT NULL DEFAULT 0,
+    version       INTEGER NOT NULL DEFAULT 0,
+    created_at    TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_wallets_userId ON wallets ("userId");
+
+CREATE TABLE IF NOT EXISTS user_sessions (
+    id           SERIAL PRIMARY KEY,
+    "userId"     INTEGER NOT NULL REFERENCES players ("userId"),
+    token        TEXT NOT NULL,
+    session_type VARCHAR(16) NOT NULL DEFAULT 'app',
+    provider     VARCHAR(32) NOT NULL DEFAULT 'local',
+    status       VARCHAR(16) NOT NULL DEFAULT 'active',
+    ip           VARCHAR(64),
+    user_agent   VARCHAR(255),
+    login_time   TIMESTAMP NOT NULL DEFAULT now(),
+    logout_time  TIMESTAMP,
+    CONSTRAINT uq_user_sessions_token_type_provider UNIQUE (token, session_type, provider)
+);
+
+CREATE INDEX IF NOT EXISTS ix_user_sessions_token_status ON user_sessions (token, status);
+
+CREATE INDEX IF NOT EXISTS ix_user_sessions_userId ON user_sessions ("userId");
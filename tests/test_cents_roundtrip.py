@@ -0,0 +1,25 @@
+"""Regression test for the server-side cents cast.
+
+CentsInt used to coerce the literal 100 in cast(Wallet.balance * 100,
+BigInteger) through its own bind processing, dividing the multiplier by 100:
+a wallet holding 1050 cents came back as 10 from every balance statement.
+"""
+
+from sqlalchemy import create_engine, insert
+
+from igw.app.models import Base, Player, Wallet
+from igw.app.providers.bsg.router import _AUTH_STMT, _BAL_STMT, _WALLET_STMT
+
+
+def test_wallet_cents_round_trip():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        conn.execute(insert(Player).values(userId=1, ext_user_id="x", email="x@y"))
+        conn.execute(insert(Wallet).values(userId=1, currency_code="USD", balance=1050))
+
+        assert conn.execute(_WALLET_STMT, {"uid": 1, "cur": "USD"}).scalar() == 1050
+        assert conn.execute(_BAL_STMT, {"uid": 1, "cur": "USD"}).first() == (1050, 0)
+        assert conn.execute(
+            _AUTH_STMT, {"uid": 1, "cur": "USD", "tok": "t"}
+        ).first() == (None, None, 1050)